@@ -10,7 +10,6 @@ import re
 import sys
 import time
 import json
-import glob
 import threading
 import queue
 import argparse
@@ -18,6 +17,7 @@ import logging
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
@@ -28,8 +28,20 @@ MAX_CONNECTIONS = 3
 CHUNK_SIZE = 8192 * 16  # 128KB chunks
 TIMEOUT = 30
 MAX_RETRIES = 3
+PROGRESS_UPDATE_INTERVAL = 1.0  # Seconds between shared progress updates
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
 USER_AGENT = "WikipediaDumpDownloader/1.0 (https://github.com/user/wiki-downloader)"
 
+# Date directories (YYYYMMDD) linked from a wiki's dump listing
+DUMP_DATE_RE = re.compile(r'href="(\d{8})/"')
+
+# Matches dump filenames (langwiki-date-pages-articles...bz2), with an
+# optional .download suffix for partial downloads
+DUMP_FILENAME_RE = re.compile(r'^([a-z\-]+)wiki-.*-pages-articles.*\.bz2(\.download)?$')
+
+# Wiki hostnames (en.wikipedia.org, de.wikipedia.org, ...) on the list of Wikipedias
+WIKI_HOST_RE = re.compile(r'([a-z\-]+)\.wikipedia\.org')
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,10 +54,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def create_session(max_connections=MAX_CONNECTIONS):
+    """Create a keep-alive session with retry strategy and a connection pool per host."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=max_connections,
+        pool_maxsize=max_connections
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
 class DownloadManager:
     """Manages concurrent downloads with rate limiting."""
     
-    def __init__(self, max_connections=3):
+    def __init__(self, max_connections=3, session=None):
         self.max_connections = max_connections
         self.active_downloads = {}
         self.completed_downloads = []
@@ -54,20 +85,13 @@ class DownloadManager:
         self.total_bytes_downloaded = 0
         self.start_time = time.time()
         
-        # Setup session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=MAX_RETRIES,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        self.session.headers.update({'User-Agent': USER_AGENT})
+        # Setup session with retry strategy, unless one is shared in
+        self.session = session if session is not None else create_session(max_connections)
     
     def download_file(self, url, dest_path, lang_code):
         """Download a file with progress tracking and resume support."""
+        # Bytes written but not yet added to total_bytes_downloaded
+        unreported = 0
         try:
             # Check if file already exists
             if os.path.exists(dest_path):
@@ -99,6 +123,7 @@ class DownloadManager:
             # Start download
             response = self.session.get(url, headers=headers, stream=True, timeout=TIMEOUT)
             response.raise_for_status()
+            response.raw.decode_content = True
             
             total_size = int(response.headers.get('content-length', 0)) + resume_pos
             downloaded = resume_pos
@@ -112,19 +137,31 @@ class DownloadManager:
                     'start_time': time.time()
                 }
             
-            # Download with progress
+            # Download with progress. Chunks are read straight from the raw
+            # stream and progress is only published under the lock every
+            # PROGRESS_UPDATE_INTERVAL seconds rather than once per chunk.
+            last_update = time.monotonic()
+            read = response.raw.read
             with open(dest_path, mode) as f:
-                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
+                while True:
+                    chunk = read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    unreported += len(chunk)
+                    
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_UPDATE_INTERVAL:
                         with self.lock:
                             self.active_downloads[lang_code]['downloaded'] = downloaded
-                            self.total_bytes_downloaded += len(chunk)
+                            self.total_bytes_downloaded += unreported
+                        unreported = 0
+                        last_update = now
             
             # Mark as complete
             with self.lock:
+                self.total_bytes_downloaded += unreported
                 del self.active_downloads[lang_code]
                 self.completed_downloads.append(lang_code)
             
@@ -134,6 +171,8 @@ class DownloadManager:
         except Exception as e:
             logger.error(f"[{lang_code}] Download failed: {str(e)}")
             with self.lock:
+                # Bytes already written still count towards the total
+                self.total_bytes_downloaded += unreported
                 if lang_code in self.active_downloads:
                     del self.active_downloads[lang_code]
                 self.failed_downloads.append((lang_code, str(e)))
@@ -141,11 +180,10 @@ class DownloadManager:
     
     def format_bytes(self, bytes_val):
         """Format bytes to human readable string."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_val < 1024.0:
-                return f"{bytes_val:.2f} {unit}"
-            bytes_val /= 1024.0
-        return f"{bytes_val:.2f} PB"
+        # Each unit is 2**10 times the previous one, so the unit follows
+        # directly from the bit length of the whole number of bytes
+        unit_index = min(max(int(bytes_val).bit_length() - 1, 0) // 10, len(BYTE_UNITS) - 1)
+        return f"{bytes_val / 1024 ** unit_index:.2f} {BYTE_UNITS[unit_index]}"
     
     def get_progress_string(self):
         """Get current progress status string."""
@@ -172,17 +210,38 @@ class DownloadManager:
             return '\n'.join(status_lines)
 
 
-def get_all_wikipedia_languages():
+class RateLimiter:
+    """Spaces requests from several threads at least `interval` seconds apart."""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_allowed_time = time.monotonic()
+    
+    def wait(self):
+        """Block until the caller may send its next request."""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_allowed_time - now
+            self.next_allowed_time = max(now, self.next_allowed_time) + self.interval
+        
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_all_wikipedia_languages(session=None):
     """Scrape Wikipedia languages from meta.wikimedia.org."""
+    if session is None:
+        session = create_session()
+    
     try:
         url = "https://meta.wikimedia.org/wiki/List_of_Wikipedias"
-        response = requests.get(url, timeout=TIMEOUT)
+        response = session.get(url, timeout=TIMEOUT)
         response.raise_for_status()
         
         # Extract language codes from the page
         # Looking for patterns like "en.wikipedia.org", "de.wikipedia.org", etc.
-        pattern = r'([a-z\-]+)\.wikipedia\.org'
-        languages = re.findall(pattern, response.text)
+        languages = WIKI_HOST_RE.findall(response.text)
         
         # Remove duplicates and sort
         languages = sorted(list(set(languages)))
@@ -215,33 +274,28 @@ def get_existing_dumps(target_dir):
         os.makedirs(target_dir, exist_ok=True)
         return existing
     
-    # Look for dump files
-    pattern = os.path.join(target_dir, "*wiki-*-pages-articles*.bz2")
-    files = glob.glob(pattern)
-    
-    for filepath in files:
-        filename = os.path.basename(filepath)
-        # Extract language code from filename
-        match = re.match(r'^([a-z\-]+)wiki-', filename)
-        if match:
-            lang_code = match.group(1)
-            existing.add(lang_code)
-            logger.info(f"Found existing dump for {lang_code}: {filename}")
-    
-    # Also check for partial downloads
-    partial_pattern = os.path.join(target_dir, "*wiki-*-pages-articles*.bz2.download")
-    partial_dirs = glob.glob(partial_pattern)
-    for partial in partial_dirs:
-        logger.info(f"Found partial download: {os.path.basename(partial)}")
+    # Look for complete dumps and partial downloads in a single directory scan
+    with os.scandir(target_dir) as entries:
+        for entry in entries:
+            match = DUMP_FILENAME_RE.match(entry.name)
+            if not match:
+                continue
+            
+            if match.group(2):
+                logger.info(f"Found partial download: {entry.name}")
+            else:
+                # Extract language code from filename
+                lang_code = match.group(1)
+                existing.add(lang_code)
+                logger.info(f"Found existing dump for {lang_code}: {entry.name}")
     
     return existing
 
 
-def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2):
+def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2, rate_limiter=None):
     """Find the latest available dump URL for a language."""
     if session is None:
-        session = requests.Session()
-        session.headers.update({'User-Agent': USER_AGENT})
+        session = create_session()
     
     base_url = f"https://dumps.wikimedia.org/{lang_code}wiki/"
     
@@ -251,6 +305,8 @@ def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2)
             delay = min(60, request_delay * (2 ** retry_count))  # Exponential backoff
             logger.info(f"Waiting {delay}s before retry for {lang_code}...")
             time.sleep(delay)
+        elif rate_limiter is not None:
+            rate_limiter.wait()  # Delay shared with other discovery threads
         else:
             time.sleep(request_delay)  # Standard delay between requests
         
@@ -259,8 +315,7 @@ def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2)
         response.raise_for_status()
         
         # Find all date directories (format: YYYYMMDD)
-        date_pattern = r'href="(\d{8})/"'
-        dates = re.findall(date_pattern, response.text)
+        dates = DUMP_DATE_RE.findall(response.text)
         dates = sorted(dates, reverse=True)  # Most recent first
         
         if not dates:
@@ -275,14 +330,15 @@ def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2)
                 response = session.get(dump_url, timeout=TIMEOUT)
                 response.raise_for_status()
                 
-                # Look for the pages-articles-multistream file
-                # Pattern: langwiki-date-pages-articles-multistream.xml.bz2
-                file_pattern = f'{lang_code}wiki-{date}-pages-articles-multistream\\.xml\\.bz2'
+                # Look for the pages-articles-multistream file. The name is
+                # fixed for a given language and date, so a plain substring
+                # search is enough.
+                file_name = f"{lang_code}wiki-{date}-pages-articles-multistream.xml.bz2"
                 
-                if re.search(file_pattern, response.text):
+                if file_name in response.text:
                     # Check if dump is complete (not in progress)
                     if 'in-progress' not in response.text.lower() or date != dates[0]:
-                        file_url = urljoin(dump_url, f"{lang_code}wiki-{date}-pages-articles-multistream.xml.bz2")
+                        file_url = urljoin(dump_url, file_name)
                         
                         # Verify the file exists
                         head_response = session.head(file_url, timeout=TIMEOUT)
@@ -301,7 +357,7 @@ def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2)
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 503 and retry_count < 3:
             logger.warning(f"Got 503 for {lang_code}, retrying ({retry_count + 1}/3)...")
-            return find_available_dump(lang_code, session, retry_count + 1, request_delay)
+            return find_available_dump(lang_code, session, retry_count + 1, request_delay, rate_limiter)
         else:
             logger.error(f"Failed to find dump for {lang_code}: {str(e)}")
             return None
@@ -313,10 +369,14 @@ def find_available_dump(lang_code, session=None, retry_count=0, request_delay=2)
 def download_wikipedia_dumps(languages=None, target_dir=DEFAULT_TARGET_DIR, dry_run=False, max_connections=MAX_CONNECTIONS, request_delay=2):
     """Main function to download all Wikipedia dumps."""
     
+    # One session for the whole run so every request reuses pooled
+    # keep-alive connections instead of paying a new TLS handshake
+    session = create_session(max_connections)
+    
     # Get list of all Wikipedia languages if not provided
     if languages is None:
         logger.info("Fetching list of all Wikipedia languages...")
-        languages = get_all_wikipedia_languages()
+        languages = get_all_wikipedia_languages(session)
     
     # Check existing dumps
     logger.info(f"Checking existing dumps in {target_dir}...")
@@ -342,26 +402,32 @@ def download_wikipedia_dumps(languages=None, target_dir=DEFAULT_TARGET_DIR, dry_
         return
     
     # Initialize download manager
-    manager = DownloadManager(max_connections=max_connections)
+    manager = DownloadManager(max_connections=max_connections, session=session)
     
-    # First, discover all dump URLs sequentially to avoid overwhelming the server
+    # First, discover all dump URLs. Lookups overlap across max_connections
+    # threads, while the shared rate limiter still spaces them request_delay
+    # seconds apart to avoid overwhelming the server.
     logger.info("Discovering available dump URLs...")
     dump_urls = {}
+    discover = partial(
+        find_available_dump,
+        session=manager.session,
+        request_delay=request_delay,
+        rate_limiter=RateLimiter(request_delay)
+    )
     
-    for i, lang_code in enumerate(to_download, 1):
-        logger.info(f"[{i}/{len(to_download)}] Finding dump URL for {lang_code}...")
-        dump_url = find_available_dump(lang_code, manager.session, request_delay=request_delay)
-        
-        if dump_url:
-            dump_urls[lang_code] = dump_url
-            logger.info(f"Found dump for {lang_code}")
-        else:
-            logger.warning(f"No dump URL found for {lang_code}, skipping")
-            manager.failed_downloads.append((lang_code, "No dump URL found"))
-        
-        # Print progress every 10 languages
-        if i % 10 == 0:
-            logger.info(f"Progress: {i}/{len(to_download)} languages checked, {len(dump_urls)} dumps found")
+    with ThreadPoolExecutor(max_workers=max_connections) as executor:
+        for i, (lang_code, dump_url) in enumerate(zip(to_download, executor.map(discover, to_download)), 1):
+            if dump_url:
+                dump_urls[lang_code] = dump_url
+                logger.info(f"[{i}/{len(to_download)}] Found dump for {lang_code}")
+            else:
+                logger.warning(f"[{i}/{len(to_download)}] No dump URL found for {lang_code}, skipping")
+                manager.failed_downloads.append((lang_code, "No dump URL found"))
+            
+            # Print progress every 10 languages
+            if i % 10 == 0:
+                logger.info(f"Progress: {i}/{len(to_download)} languages checked, {len(dump_urls)} dumps found")
     
     logger.info(f"Found {len(dump_urls)} available dumps to download")
     
@@ -8,8 +8,28 @@ import argparse
 import bz2
 import xml.etree.ElementTree as ET
 import glob
-from multiprocessing import Pool, cpu_count
+import io
+import mmap
+import shutil
+import subprocess
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import islice
+from operator import getitem
+from multiprocessing import Pool
 import sys
+import time
+
+try:
+    import indexed_bzip2  # Optional: parallel bz2 block decompression
+except ImportError:
+    indexed_bzip2 = None
+
+# Read size when writing the decompressed XML cache
+CACHE_COPY_CHUNK = 1 << 20
+
+# Language prefix of a dump filename (langwiki-date-pages-articles...)
+_DUMP_LANGUAGE_RE = re.compile(r'^([a-z]+)wiki-')
 
 def get_language_from_dump_path(dump_path: str) -> str:
     """
@@ -23,23 +43,153 @@ def get_language_from_dump_path(dump_path: str) -> str:
     """
     basename = os.path.basename(dump_path)
     # Pattern: langwiki-date-pages-articles...
-    match = re.match(r'^([a-z]+)wiki-', basename)
+    match = _DUMP_LANGUAGE_RE.match(basename)
     if match:
         return match.group(1)
     return 'en'  # Default to English if pattern doesn't match
 
 
-def extract_articles_from_dump(dump_path: str):
+def get_decompressed_cache_path(dump_path: str) -> str:
+    """
+    Path of the decompressed XML cache kept next to a dump.
+    
+    Args:
+        dump_path: Path to the .bz2 Wikipedia dump file
+        
+    Returns:
+        Path ending in .xml, e.g. enwiki-...-pages-articles.xml for
+        enwiki-...-pages-articles.xml.bz2
+    """
+    cache_path = os.path.splitext(dump_path)[0]
+    if not cache_path.endswith('.xml'):
+        cache_path += '.xml'
+    return cache_path
+
+
+def get_parallel_bzip2_command(dump_path: str, decompression_threads: int):
+    """
+    Command line for decompressing a dump with lbzip2 or pbzip2, if installed.
+    
+    Args:
+        dump_path: Path to the .bz2 Wikipedia dump file
+        decompression_threads: Number of threads to decompress with
+        
+    Returns:
+        Argument list writing the decompressed XML to stdout, or None if
+        neither tool is on the PATH
+    """
+    if shutil.which('lbzip2'):
+        return ['lbzip2', '-d', '-c', '-n', str(decompression_threads), dump_path]
+    if shutil.which('pbzip2'):
+        return ['pbzip2', '-d', '-c', f'-p{decompression_threads}', dump_path]
+    return None
+
+
+class PipedDump(io.RawIOBase):
+    """
+    Binary file object reading the XML a decompressor process writes to stdout.
+    
+    Closing it stops the decompressor if the XML was not read to the end. If
+    it was, a failed decompressor raises subprocess.CalledProcessError on
+    close, since its truncated output would otherwise look like a complete dump.
+    """
+    
+    def __init__(self, command: list[str]):
+        super().__init__()
+        self.command = command
+        self.proc = subprocess.Popen(command, stdout=subprocess.PIPE)
+    
+    def readable(self) -> bool:
+        return True
+    
+    def read(self, size: int = -1) -> bytes:
+        return self.proc.stdout.read(size)
+    
+    def readinto(self, buffer) -> int:
+        return self.proc.stdout.readinto(buffer)
+    
+    def close(self):
+        if self.closed:
+            return
+        reached_eof = False
+        try:
+            reached_eof = not self.proc.stdout.read(1)
+        finally:
+            # Closing the pipe stops the decompressor if we finished early
+            self.proc.stdout.close()
+            self.proc.wait()
+            super().close()
+        
+        # A decompressor stopped early by the closed pipe exits non-zero too,
+        # so only check the status when all of its output was consumed
+        if reached_eof and self.proc.returncode != 0:
+            raise subprocess.CalledProcessError(self.proc.returncode, self.command)
+
+
+def open_dump(dump_path: str, decompression_threads: int = 1, cache_decompressed: bool = False):
+    """
+    Open a .bz2 Wikipedia dump for reading the decompressed XML.
+    
+    When more than one thread is allowed, the independent bz2 blocks are
+    decompressed in parallel with indexed_bzip2 if it is installed, or else
+    by piping through lbzip2/pbzip2 if either is on the PATH. Otherwise the
+    standard library bz2 module is used.
+    
+    With cache_decompressed, the XML is decompressed once to a file next to
+    the dump and later runs memory-map that file instead of decompressing.
+    
+    Args:
+        dump_path: Path to the .bz2 Wikipedia dump file
+        decompression_threads: Number of threads to decompress with
+        cache_decompressed: If True, read from (and create) the decompressed cache
+        
+    Returns:
+        Binary file object with the decompressed XML
+    """
+    if cache_decompressed:
+        cache_path = get_decompressed_cache_path(dump_path)
+        if not os.path.exists(cache_path):
+            # Decompress to a temporary name first so an interrupted run
+            # never leaves a truncated cache behind
+            tmp_path = cache_path + '.tmp'
+            try:
+                with open_dump(dump_path, decompression_threads) as src, open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, CACHE_COPY_CHUNK)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        
+        with open(cache_path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The XML is read front to back, so let the kernel read ahead
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+    
+    if decompression_threads > 1:
+        if indexed_bzip2 is not None:
+            return indexed_bzip2.open(dump_path, parallelization=decompression_threads)
+        command = get_parallel_bzip2_command(dump_path, decompression_threads)
+        if command is not None:
+            return PipedDump(command)
+    return bz2.open(dump_path, 'rb')
+
+
+def extract_articles_from_dump(dump_path: str, decompression_threads: int = 1, cache_decompressed: bool = False):
     """
     Generator that yields (title, text) tuples from a Wikipedia dump file.
     
     Args:
         dump_path: Path to the .bz2 Wikipedia dump file
+        decompression_threads: Number of threads to decompress with
+        cache_decompressed: If True, read from (and create) the decompressed XML cache
         
     Yields:
         Tuples of (title, text) for each article
     """
-    with bz2.open(dump_path, 'rt', encoding='utf-8') as f:
+    with open_dump(dump_path, decompression_threads, cache_decompressed) as f:
         # Parse without namespace first to detect version
         context = ET.iterparse(f, events=('start', 'end'))
         context = iter(context)
@@ -47,28 +197,41 @@ def extract_articles_from_dump(dump_path: str):
         # Get the root element and detect namespace
         event, root = next(context)
         
-        # Extract namespace from root tag
-        namespace = None
+        # Extract namespace from root tag, falling back to 0.11 if none is detected
+        namespace = 'http://www.mediawiki.org/xml/export-0.11/'
         if '}' in root.tag:
             namespace = root.tag.split('}')[0][1:]
         
-        # Define namespace dict based on detected version
-        if namespace:
-            ns = {'mw': namespace}
-        else:
-            # Fallback to 0.11 if no namespace detected
-            ns = {'mw': 'http://www.mediawiki.org/xml/export-0.11/'}
+        # Fully-qualified tag names, so elements are matched with a plain
+        # string comparison instead of splitting tags or XPath lookups
+        ns_prefix = '{' + namespace + '}'
+        page_tag = ns_prefix + 'page'
+        title_tag = ns_prefix + 'title'
+        ns_tag = ns_prefix + 'ns'
+        redirect_tag = ns_prefix + 'redirect'
+        revision_tag = ns_prefix + 'revision'
+        text_tag = ns_prefix + 'text'
         
         for event, elem in context:
-            # Handle namespaced tags
-            tag = elem.tag.split('}')[1] if '}' in elem.tag else elem.tag
-            
-            if event == 'end' and tag == 'page':
-                # Extract page data using detected namespace
-                title_elem = elem.find('.//mw:title', ns)
-                text_elem = elem.find('.//mw:text', ns)
-                ns_elem = elem.find('.//mw:ns', ns)
-                redirect_elem = elem.find('.//mw:redirect', ns)
+            if event == 'end' and elem.tag == page_tag:
+                # Extract page data from the page's direct children
+                title_elem = text_elem = ns_elem = redirect_elem = None
+                for child in elem:
+                    tag = child.tag
+                    if tag == title_tag:
+                        if title_elem is None:
+                            title_elem = child
+                    elif tag == ns_tag:
+                        if ns_elem is None:
+                            ns_elem = child
+                    elif tag == redirect_tag:
+                        if redirect_elem is None:
+                            redirect_elem = child
+                    elif tag == revision_tag and text_elem is None:
+                        for revision_child in child:
+                            if revision_child.tag == text_tag:
+                                text_elem = revision_child
+                                break
                 
                 # Skip if not in main namespace (0) or if redirect
                 if ns_elem is not None and ns_elem.text == '0' and redirect_elem is None:
@@ -84,90 +247,233 @@ def extract_articles_from_dump(dump_path: str):
                 # Also clear the root element's children
                 root.clear()
 
-def has_isbn_nearby(text: str, match_start: int, match_end: int, max_distance: int = 6) -> bool:
+# URLs are stripped before searching so numbers inside links (e.g. Google
+# Books ?isbn= parameters) are never reported
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Shortest text that can contain a match: 'ISBN' directly followed by an ISBN-10
+MIN_ISBN_TEXT_LENGTH = len('ISBN') + 10
+
+# Characters removed when normalizing an ISBN: hyphens and every character
+# the \s in the search pattern matches (the str.isspace() characters)
+ISBN_SEPARATORS = (
+    '-\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003'
+    '\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+)
+
+# str.translate deletion table, so stripping separators is a single C-level
+# pass with no regex engine involved
+_STRIP_TABLE = str.maketrans('', '', ISBN_SEPARATORS)
+
+# Entries kept by the ISBN normalization and validation caches. The same
+# books are cited across many articles, so most lookups are hits
+ISBN_CACHE_SIZE = 131072
+
+
+def strip_isbn_separators(isbn: str) -> str:
     """
-    Check if 'ISBN' appears within max_distance characters before the match.
+    Remove hyphens and whitespace from an ISBN, leaving its case unchanged.
     
     Args:
-        text: The full text
-        match_start: Start position of the ISBN candidate
-        match_end: End position of the ISBN candidate
-        max_distance: Maximum characters to look before the match
+        isbn: ISBN as written in the article
         
     Returns:
-        True if 'ISBN' is found within max_distance characters
+        ISBN without separators, e.g. '080442957x' for '0-8044-2957-x'
     """
-    # Look for ISBN within max_distance characters before the match
-    search_start = max(0, match_start - max_distance - 4)  # -4 for 'ISBN' length
-    search_text = text[search_start:match_start].lower()
+    return isbn.translate(_STRIP_TABLE)
+
+
+@lru_cache(maxsize=ISBN_CACHE_SIZE)
+def normalize_isbn(isbn: str) -> str:
+    """
+    Remove hyphens and whitespace from an ISBN and upper-case a trailing 'x'.
     
-    # Check if 'isbn' appears and is close enough
-    isbn_pos = search_text.rfind('isbn')
-    if isbn_pos != -1:
-        # Calculate actual distance from 'isbn' end to match start
-        actual_distance = len(search_text) - isbn_pos - 4
-        return actual_distance <= max_distance
+    Args:
+        isbn: ISBN as written in the article
+        
+    Returns:
+        Normalized ISBN, e.g. '080442957X' for '0-8044-2957-x'
+    """
+    return strip_isbn_separators(isbn).upper()
+
+
+# Sequences of digits with optional hyphens/spaces that could be ISBNs. The
+# negative lookbehind ensures we don't start matching in the middle of a number
+_ISBN_CANDIDATE_RE = re.compile(r'(?<![0-9])(\d[\d\-\s]{8,16}[\dXx])\b')
+
+# 'ISBN' in upper or lower case, searched for just before each candidate
+_ISBN_KEYWORD_RE = re.compile(r'[Ii][Ss][Bb][Nn]')
+
+
+def may_contain_isbn(text: str) -> bool:
+    """
+    Cheap check ruling out articles that can't contain an ISBN.
+    
+    Stubs too short to hold 'ISBN' and a 10-digit number can't match, and
+    most other articles never mention ISBNs. Lower-casing first matches every
+    spelling the search accepts.
     
-    return False
+    Args:
+        text: Article text
+        
+    Returns:
+        False if find_potential_isbns is certain to find nothing
+    """
+    return len(text) >= MIN_ISBN_TEXT_LENGTH and 'isbn' in text.lower()
 
 
 def find_potential_isbns(text: str, context_chars: int = 50, proximity: int = 6) -> list[dict]:
     """
     Finds all potential ISBN numbers in text with surrounding context.
-    Only returns numbers that have 'ISBN' nearby in the context.
+    Only returns numbers that have 'ISBN' within proximity characters before them.
 
     Args:
         text: The text to search for ISBNs
         context_chars: Number of characters to include before and after ISBN
+        proximity: Maximum characters between end of 'ISBN' and the number
 
     Returns:
-        List of dicts with 'isbn' and 'context' keys
+        List of dicts with 'isbn', 'cleaned' (separators removed, upper-cased)
+        and 'context' keys
+        
+    Example:
+        Every number within the window is reported, even when one 'ISBN'
+        introduces several of them:
+        
+        >>> text = 'ISBN 0306406152 / 9780306406157'
+        >>> [found['cleaned'] for found in find_potential_isbns(text, proximity=20)]
+        ['0306406152', '9780306406157']
+        >>> [found['cleaned'] for found in find_potential_isbns(text, proximity=6)]
+        ['0306406152']
     """
-    # First, remove URLs from the text to avoid false positives
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-    text_without_urls = re.sub(url_pattern, ' ', text)
+    # Skip articles that can't match before running any regex
+    if not may_contain_isbn(text):
+        return []
     
-    # Look for sequences of digits with optional hyphens/spaces
-    # Using negative lookbehind to ensure we don't start matching in the middle of a number
-    pattern = r'(?<![0-9])(\d[\d\-\s]{8,16}[\dXx])\b'
+    # Remove URLs from the text to avoid false positives
+    text_without_urls = _URL_RE.sub(' ', text)
     
     potential_isbns = []
     
-    for match in re.finditer(pattern, text_without_urls):
+    find_keyword = _ISBN_KEYWORD_RE.search
+    
+    for match in _ISBN_CANDIDATE_RE.finditer(text_without_urls):
+        # Check if 'ISBN' appears within proximity characters before the
+        # match, searching that window in place rather than slicing it out
+        match_start = match.start(1)
+        if find_keyword(text_without_urls, max(0, match_start - proximity - 4), match_start) is None:
+            continue
+        
         isbn = match.group(1)
-        cleaned = re.sub(r'[-\s]', '', isbn).upper()
+        cleaned = normalize_isbn(isbn)
         
         # Only accept 10 or 13 character results
         if len(cleaned) == 10:
-            if cleaned[:9].isdigit() and (cleaned[9].isdigit() or cleaned[9] == 'X'):
-                # Get surrounding context
-                start = max(0, match.start() - context_chars)
-                end = min(len(text_without_urls), match.end() + context_chars)
-                context = text_without_urls[start:end].strip()
-                
-                # Check if 'ISBN' appears within proximity characters before the match
-                if has_isbn_nearby(text_without_urls, match.start(), match.end(), proximity):
-                    potential_isbns.append({
-                        'isbn': isbn,
-                        'context': context
-                    })
+            if not (cleaned[:9].isdigit() and (cleaned[9].isdigit() or cleaned[9] == 'X')):
+                continue
         elif len(cleaned) == 13:
-            if cleaned.isdigit():
-                # Get surrounding context
-                start = max(0, match.start() - context_chars)
-                end = min(len(text_without_urls), match.end() + context_chars)
-                context = text_without_urls[start:end].strip()
-                
-                # Check if 'ISBN' appears within proximity characters before the match
-                if has_isbn_nearby(text_without_urls, match.start(), match.end(), proximity):
-                    potential_isbns.append({
-                        'isbn': isbn,
-                        'context': context
-                    })
+            if not cleaned.isdigit():
+                continue
+        else:
+            continue
+        
+        # Get surrounding context
+        start = max(0, match_start - context_chars)
+        end = min(len(text_without_urls), match.end(1) + context_chars)
+        context = text_without_urls[start:end].strip()
+        
+        potential_isbns.append({
+            'isbn': isbn,
+            'cleaned': cleaned,
+            'context': context
+        })
     
     return potential_isbns
 
 
+# Checksum weights for the first 9 digits of an ISBN-10
+ISBN10_WEIGHTS = (10, 9, 8, 7, 6, 5, 4, 3, 2)
+
+# Per-position lookup tables for ISBN-10, indexed by ASCII character code:
+# entry [i][c] is the weighted value of character c at position i. The last
+# table is the check digit, where 'X' counts as 10
+_ISBN10_TABLES = tuple(
+    tuple((c - 48) * weight if 48 <= c <= 57 else 0 for c in range(256))
+    for weight in ISBN10_WEIGHTS
+) + (tuple(c - 48 if 48 <= c <= 57 else 10 if c == ord('X') else 0 for c in range(256)),)
+
+
+def _to_ascii_digits(cleaned: str) -> str:
+    """
+    Convert non-ASCII decimal digits (e.g. Persian or Arabic-Indic) to ASCII.
+    
+    An 'X' check character is kept as-is.
+    """
+    return ''.join(c if c == 'X' else str(int(c)) for c in cleaned)
+
+
+@lru_cache(maxsize=ISBN_CACHE_SIZE)
+def validate_isbn10_clean(cleaned: str) -> bool:
+    """
+    Validates an already cleaned ISBN-10 using the check digit algorithm.
+    
+    Args:
+        cleaned: 10 characters without hyphens/spaces: 9 digits followed by
+            a digit or upper-case 'X', as produced by find_potential_isbns
+            
+    Returns:
+        True if the checksum is valid, False otherwise
+    """
+    if not cleaned.isascii():
+        cleaned = _to_ascii_digits(cleaned)
+    
+    # Iterating bytes yields the character codes, so each position's weighted
+    # value is a table lookup and the whole sum runs in C
+    total = sum(map(getitem, _ISBN10_TABLES, cleaned.encode('ascii')))
+    
+    return total % 11 == 0
+
+
+@lru_cache(maxsize=ISBN_CACHE_SIZE)
+def validate_isbn13_clean(cleaned: str) -> bool:
+    """
+    Validates an already cleaned ISBN-13 using the check digit algorithm.
+    
+    Args:
+        cleaned: 13 digits without hyphens/spaces, as produced by
+            find_potential_isbns
+            
+    Returns:
+        True if the checksum is valid, False otherwise
+    """
+    if not cleaned.isascii():
+        cleaned = _to_ascii_digits(cleaned)
+    
+    # Digits in even positions have weight 1, odd positions weight 3. Summing
+    # bytes adds the character codes in C; the '0' offsets (48 per digit,
+    # weighted) are removed in one subtraction
+    digits = cleaned.encode('ascii')
+    total = sum(digits[0:12:2]) + 3 * sum(digits[1:12:2]) - 48 * 24
+    
+    # Check digit calculation
+    check_digit = (10 - (total % 10)) % 10
+    
+    return digits[12] - 48 == check_digit
+
+
+# Checksum validator for each accepted cleaned ISBN length
+CLEAN_VALIDATORS = {
+    10: validate_isbn10_clean,
+    13: validate_isbn13_clean,
+}
+
+# Format label for each accepted cleaned ISBN length
+ISBN_FORMATS = {
+    10: 'ISBN-10',
+    13: 'ISBN-13',
+}
+
+
 def validate_isbn10(isbn: str) -> bool:
     """
     Validates an ISBN-10 using the check digit algorithm.
@@ -179,30 +485,19 @@ def validate_isbn10(isbn: str) -> bool:
         True if valid ISBN-10, False otherwise
     """
     # Remove hyphens and spaces
-    cleaned = re.sub(r'[-\s]', '', isbn).upper()
+    cleaned = normalize_isbn(isbn)
     
     # Must be exactly 10 characters
     if len(cleaned) != 10:
         return False
     
     # First 9 must be digits, 10th can be digit or X
-    if not cleaned[:9].isdigit():
+    if not cleaned[:9].isdecimal():
         return False
-    if not (cleaned[9].isdigit() or cleaned[9] == 'X'):
+    if not (cleaned[9].isdecimal() or cleaned[9] == 'X'):
         return False
     
-    # Calculate checksum
-    total = 0
-    for i in range(9):
-        total += int(cleaned[i]) * (10 - i)
-    
-    # Add check digit
-    if cleaned[9] == 'X':
-        total += 10
-    else:
-        total += int(cleaned[9])
-    
-    return total % 11 == 0
+    return validate_isbn10_clean(cleaned)
 
 
 def validate_isbn13(isbn: str) -> bool:
@@ -216,24 +511,13 @@ def validate_isbn13(isbn: str) -> bool:
         True if valid ISBN-13, False otherwise
     """
     # Remove hyphens and spaces
-    cleaned = re.sub(r'[-\s]', '', isbn)
+    cleaned = normalize_isbn(isbn)
     
     # Must be exactly 13 digits
-    if len(cleaned) != 13 or not cleaned.isdigit():
+    if len(cleaned) != 13 or not cleaned.isdecimal():
         return False
     
-    # Calculate checksum
-    total = 0
-    for i in range(12):
-        if i % 2 == 0:
-            total += int(cleaned[i])
-        else:
-            total += int(cleaned[i]) * 3
-    
-    # Check digit calculation
-    check_digit = (10 - (total % 10)) % 10
-    
-    return int(cleaned[12]) == check_digit
+    return validate_isbn13_clean(cleaned)
 
 
 def deduplicate_isbns(isbns: list[str]) -> list[str]:
@@ -247,18 +531,29 @@ def deduplicate_isbns(isbns: list[str]) -> list[str]:
     Returns:
         List of unique ISBNs in their original format
     """
-    seen_normalized = set()
-    unique_isbns = []
-    
+    # Map each normalized ISBN (hyphens and spaces removed) to the first
+    # spelling seen; dicts keep insertion order, so the input order is kept
+    unique_isbns = {}
     for isbn in isbns:
-        # Normalize by removing hyphens and spaces
-        normalized = re.sub(r'[-\s]', '', isbn).upper()
-        
-        if normalized not in seen_normalized:
-            seen_normalized.add(normalized)
-            unique_isbns.append(isbn)
+        unique_isbns.setdefault(normalize_isbn(isbn), isbn)
     
-    return unique_isbns
+    return list(unique_isbns.values())
+
+
+def available_cpus() -> int:
+    """
+    Number of CPUs this process may run on.
+    
+    Unlike os.cpu_count(), this respects CPU affinity, so containers and
+    batch schedulers that pin the process to a subset of cores aren't
+    oversubscribed.
+    
+    Returns:
+        Number of usable CPUs (at least 1)
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
 
 def process_single_dump_worker(args: tuple) -> tuple[str, list[dict], float, str, int]:
@@ -266,15 +561,15 @@ def process_single_dump_worker(args: tuple) -> tuple[str, list[dict], float, str
     Worker function for multiprocessing that wraps process_single_dump.
     
     Args:
-        args: Tuple of (dump_path, context_chars, proximity)
+        args: Tuple of (dump_path, context_chars, proximity, decompression_threads, cache_decompressed)
         
     Returns:
         Tuple of (dump_path, results, elapsed_time, error_message, article_count)
     """
-    dump_path, context_chars, proximity = args
+    dump_path, context_chars, proximity, decompression_threads, cache_decompressed = args
     try:
         # Run in quiet mode for parallel processing
-        results, elapsed, article_count = process_single_dump(dump_path, context_chars, proximity, quiet=True)
+        results, elapsed, article_count = process_single_dump(dump_path, context_chars, proximity, quiet=True, decompression_threads=decompression_threads, cache_decompressed=cache_decompressed)
         
         # Print completion message for this dump
         language = get_language_from_dump_path(dump_path)
@@ -286,14 +581,136 @@ def process_single_dump_worker(args: tuple) -> tuple[str, list[dict], float, str
         return (dump_path, [], 0.0, str(e), 0)
 
 
-def process_single_dump(dump_path: str, context_chars: int = 50, proximity: int = 6, quiet: bool = False) -> tuple[list[dict], float, int]:
+def process_article(title: str, text: str, language: str, context_chars: int = 50, proximity: int = 6) -> dict:
+    """
+    Find and validate the ISBNs in a single article.
+    
+    Args:
+        title: Article title
+        text: Article wikitext
+        language: Language code of the wiki the article comes from
+        context_chars: Number of context characters around ISBN
+        proximity: Maximum characters between ISBN and number
+        
+    Returns:
+        Article result dict, or None if the article has no ISBNs
+    """
+    # Find ISBNs in article text
+    isbn_results = find_potential_isbns(text, context_chars, proximity)
+    
+    if not isbn_results:  # Only process articles with ISBNs
+        return None
+    
+    valid_isbns = []
+    invalid_isbns = []
+    
+    for result in isbn_results:
+        # find_potential_isbns has already cleaned the ISBN and
+        # checked its length and characters
+        cleaned = result['cleaned']
+        
+        # Check validity with the validator for this length. Valid ISBNs are
+        # only ever counted, so drop their context rather than carry (and,
+        # with parallel workers, pickle) it for every article
+        if CLEAN_VALIDATORS[len(cleaned)](cleaned):
+            del result['context']
+            valid_isbns.append(result)
+        else:
+            invalid_isbns.append(result)
+    
+    return {
+        'title': title,
+        'language': language,
+        'total_found': len(isbn_results),
+        'valid_isbns': valid_isbns,
+        'invalid_isbns': invalid_isbns
+    }
+
+
+def process_article_batch(args: tuple) -> tuple[list[dict], int]:
+    """
+    Worker function that processes a batch of articles from one dump.
+    
+    Args:
+        args: Tuple of (articles, language, context_chars, proximity), where
+            articles is a list of (title, text) tuples
+            
+    Returns:
+        Tuple of (results for the articles with ISBNs, number of articles in the batch)
+    """
+    articles, language, context_chars, proximity = args
+    
+    results = []
+    for title, text in articles:
+        article_result = process_article(title, text, language, context_chars, proximity)
+        if article_result is not None:
+            results.append(article_result)
+    
+    return results, len(articles)
+
+
+def iter_article_batches(articles, batch_size: int):
+    """
+    Group a stream of (title, text) tuples into lists of up to batch_size.
+    
+    Args:
+        articles: Iterable of (title, text) tuples
+        batch_size: Maximum number of articles per batch
+        
+    Yields:
+        Lists of (title, text) tuples
+    """
+    articles = iter(articles)
+    while True:
+        batch = list(islice(articles, max(batch_size, 1)))
+        if not batch:
+            return
+        yield batch
+
+
+def imap_bounded(pool, func, iterable, max_pending: int):
+    """
+    Like Pool.imap, but with at most max_pending tasks in flight.
+    
+    Pool.imap reads its whole input up front, which for a dump would hold
+    every decompressed article in memory. Submitting tasks as results are
+    consumed keeps the reader only a few batches ahead of the workers.
+    
+    Args:
+        pool: multiprocessing Pool to run the tasks in
+        func: Function to apply to each item
+        iterable: Input items
+        max_pending: Maximum number of submitted but unconsumed tasks
+        
+    Yields:
+        func(item) for each item, in input order
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def process_single_dump(dump_path: str, context_chars: int = 50, proximity: int = 6, quiet: bool = False, decompression_threads: int = 1, article_workers: int = 1, article_batch: int = 64, cache_decompressed: bool = False) -> tuple[list[dict], float, int]:
     """
     Process a single Wikipedia dump file to extract and validate ISBNs.
     
+    With more than one article worker, this process only decompresses and
+    parses the dump and drops articles that can't contain an ISBN, while
+    batches of the rest are searched and validated in a pool of worker
+    processes.
+    
     Args:
         dump_path: Path to the dump file
         context_chars: Number of context characters around ISBN
         quiet: If True, suppress progress output (for parallel processing)
+        decompression_threads: Number of threads to decompress the dump with
+        article_workers: Number of processes searching articles for ISBNs
+        article_batch: Number of articles sent to a worker at a time
+        cache_decompressed: If True, read from (and create) the decompressed XML cache
         
     Returns:
         Tuple of (results list, processing time in seconds, total articles processed)
@@ -303,58 +720,56 @@ def process_single_dump(dump_path: str, context_chars: int = 50, proximity: int
     
     results = []
     article_count = 0
-    start_time = datetime.now()
+    next_progress = 100
+    # Monotonic seconds; only read when a progress line is printed
+    start_time = time.monotonic()
     
     if not quiet:
         print(f"\nProcessing dump: {os.path.basename(dump_path)} (Language: {language})")
         print("="*60)
     
-    for title, text in extract_articles_from_dump(dump_path):
-        article_count += 1
-        
-        # Find ISBNs in article text
-        isbn_results = find_potential_isbns(text, context_chars, proximity)
+    # Articles that can't contain an ISBN are only counted here, so the
+    # workers are never sent (and the text never pickled for) most articles
+    skipped_count = 0
+    
+    def searchable_articles():
+        nonlocal skipped_count
+        for title, text in extract_articles_from_dump(dump_path, decompression_threads, cache_decompressed):
+            if may_contain_isbn(text):
+                yield title, text
+            else:
+                skipped_count += 1
+    
+    searched_count = 0
+    tasks = ((batch, language, context_chars, proximity) for batch in iter_article_batches(searchable_articles(), article_batch))
+    
+    pool = Pool(article_workers) if article_workers > 1 else None
+    try:
+        if pool is None:
+            batch_outputs = map(process_article_batch, tasks)
+        else:
+            # Keep a couple of batches queued per worker so none sit idle
+            batch_outputs = imap_bounded(pool, process_article_batch, tasks, 2 * article_workers)
         
-        if isbn_results:  # Only process articles with ISBNs
-            valid_isbns = []
-            invalid_isbns = []
-            
-            for result in isbn_results:
-                isbn = result['isbn']
-                cleaned = re.sub(r'[-\s]', '', isbn)
-                
-                # Check validity
-                if len(cleaned) == 10:
-                    is_valid = validate_isbn10(isbn)
-                elif len(cleaned) == 13:
-                    is_valid = validate_isbn13(isbn)
-                else:
-                    is_valid = False
-                
-                if is_valid:
-                    valid_isbns.append(result)
-                else:
-                    invalid_isbns.append(result)
-            
-            article_result = {
-                'title': title,
-                'language': language,
-                'url': f"https://{language}.wikipedia.org/wiki/{title.replace(' ', '_')}",
-                'total_found': len(isbn_results),
-                'valid_isbns': valid_isbns,
-                'invalid_isbns': invalid_isbns
-            }
-            
-            results.append(article_result)
+        for batch_results, batch_size in batch_outputs:
+            searched_count += batch_size
+            article_count = searched_count + skipped_count
+            results.extend(batch_results)
             
             # Progress update every 100 articles with ISBNs
-            if not quiet and len(results) % 100 == 0:
-                elapsed = (datetime.now() - start_time).total_seconds()
+            if not quiet and len(results) >= next_progress:
+                next_progress = (len(results) // 100 + 1) * 100
+                elapsed = time.monotonic() - start_time
                 rate = article_count / elapsed if elapsed > 0 else 0
                 print(f"  [{language.upper()}] Processed {article_count} articles, found ISBNs in {len(results)} ({rate:.1f} articles/sec)")
+    finally:
+        if pool is not None:
+            pool.terminate()
+    
+    article_count = searched_count + skipped_count
     
     # Final stats for this dump
-    elapsed = (datetime.now() - start_time).total_seconds()
+    elapsed = time.monotonic() - start_time
     if not quiet:
         print(f"  [{language.upper()}] Completed: {article_count} articles processed in {elapsed:.1f}s")
         print(f"  [{language.upper()}] Found ISBNs in {len(results)} articles")
@@ -362,7 +777,7 @@ def process_single_dump(dump_path: str, context_chars: int = 50, proximity: int
     return results, elapsed, article_count
 
 
-def process_all_dumps(dumps_dir: str = "./dumps", context_chars: int = 50, proximity: int = 6, workers: int = 1) -> tuple[list[dict], list[str], datetime, datetime, dict[str, float], int, dict[str, int]]:
+def process_all_dumps(dumps_dir: str = "./dumps", context_chars: int = 50, proximity: int = 6, workers: int = 1, article_batch: int = 64, cache_decompressed: bool = False) -> tuple[list[dict], list[str], datetime, datetime, dict[str, float], int, dict[str, int]]:
     """
     Process all Wikipedia dump files in a directory.
     
@@ -371,6 +786,8 @@ def process_all_dumps(dumps_dir: str = "./dumps", context_chars: int = 50, proxi
         context_chars: Number of context characters around ISBN
         proximity: Maximum characters between ISBN and number
         workers: Number of parallel workers (default 1 for sequential, -1 for all CPUs)
+        article_batch: Number of articles per worker batch when a single dump is split across workers
+        cache_decompressed: If True, keep decompressed XML next to each dump and reuse it on later runs
         
     Returns:
         Tuple of (results, dump_files, start_time, end_time, language_times, total_articles_processed, language_article_counts)
@@ -390,21 +807,35 @@ def process_all_dumps(dumps_dir: str = "./dumps", context_chars: int = 50, proxi
     print(f"Found {len(dump_files)} dump file(s) to process")
     
     # Determine number of workers
+    cpus = available_cpus()
     if workers == -1:
-        workers = cpu_count() - 1  # Leave one core free
-    workers = max(1, min(workers, len(dump_files), cpu_count()))
+        workers = cpus - 1  # Leave one core free
+    workers = max(1, min(workers, cpus))
+    
+    # Parallelize across dumps. With a single dump, spread its articles over
+    # the workers instead so the extra cores aren't left idle
+    article_workers = workers if len(dump_files) == 1 else 1
+    workers = min(workers, len(dump_files))
+    
+    # Share the remaining cores between workers for parallel decompression
+    # (only used when indexed_bzip2 is installed or lbzip2/pbzip2 is on the
+    # PATH) without oversubscribing
+    decompression_threads = max(1, cpus // max(workers, article_workers))
     
     start_time = datetime.now()
     
     if workers == 1:
         # Sequential processing (original behavior)
-        print("Processing dumps sequentially...")
+        if article_workers > 1:
+            print(f"Processing dump with {article_workers} article workers...")
+        else:
+            print("Processing dumps sequentially...")
         for dump_path in dump_files:
             # Get language from filename
             language = get_language_from_dump_path(dump_path)
             
             # Process dump and get results with timing
-            dump_results, dump_time, article_count = process_single_dump(dump_path, context_chars, proximity)
+            dump_results, dump_time, article_count = process_single_dump(dump_path, context_chars, proximity, decompression_threads=decompression_threads, article_workers=article_workers, article_batch=article_batch, cache_decompressed=cache_decompressed)
             all_results.extend(dump_results)
             total_articles_processed += article_count
             
@@ -422,32 +853,37 @@ def process_all_dumps(dumps_dir: str = "./dumps", context_chars: int = 50, proxi
         print(f"Processing dumps in parallel with {workers} workers...")
         
         # Prepare arguments for worker function
-        worker_args = [(dump_path, context_chars, proximity) for dump_path in dump_files]
+        worker_args = [(dump_path, context_chars, proximity, decompression_threads, cache_decompressed) for dump_path in dump_files]
         
-        # Process dumps in parallel
-        with Pool(workers) as pool:
-            # Use imap_unordered for better progress tracking
-            results = pool.map(process_single_dump_worker, worker_args)
+        # Results arrive as each dump finishes; keep them per dump so the
+        # combined output is still in dump file order
+        results_by_dump = {}
         
-        # Process results
-        for dump_path, dump_results, dump_time, error, article_count in results:
-            if error:
-                print(f"Failed to process {dump_path}: {error}")
-                continue
+        # Process dumps in parallel. Each task is a whole dump, so hand them
+        # out one at a time, and recycle workers so parser memory from one
+        # dump is released before the next
+        with Pool(workers, maxtasksperchild=1) as pool:
+            for dump_path, dump_results, dump_time, error, article_count in pool.imap_unordered(process_single_dump_worker, worker_args, chunksize=1):
+                if error:
+                    print(f"Failed to process {dump_path}: {error}")
+                    continue
                 
-            language = get_language_from_dump_path(dump_path)
-            all_results.extend(dump_results)
-            total_articles_processed += article_count
-            
-            # Accumulate time for this language
-            if language not in language_times:
-                language_times[language] = 0.0
-            language_times[language] += dump_time
-            
-            # Track articles per language
-            if language not in language_article_counts:
-                language_article_counts[language] = 0
-            language_article_counts[language] += article_count
+                language = get_language_from_dump_path(dump_path)
+                results_by_dump[dump_path] = dump_results
+                total_articles_processed += article_count
+                
+                # Accumulate time for this language
+                if language not in language_times:
+                    language_times[language] = 0.0
+                language_times[language] += dump_time
+                
+                # Track articles per language
+                if language not in language_article_counts:
+                    language_article_counts[language] = 0
+                language_article_counts[language] += article_count
+        
+        for dump_path in dump_files:
+            all_results.extend(results_by_dump.get(dump_path, []))
     
     end_time = datetime.now()
     
@@ -481,106 +917,143 @@ def save_report(results: list[dict], dump_files: list[str], start_time: datetime
     articles_with_isbns = len(results)
     if total_articles_processed is None:
         total_articles_processed = articles_with_isbns  # Fallback for backwards compatibility
-    total_valid = sum(len(r['valid_isbns']) for r in results)
-    total_invalid = sum(len(r['invalid_isbns']) for r in results)
-    total_isbns = total_valid + total_invalid
     processing_time = (end_time - start_time).total_seconds()
     
-    # Count unique ISBNs and languages
-    unique_valid = set()
-    unique_invalid = set()
+    # Aggregate everything per language in a single walk over the results
+    isbn10_valid = isbn13_valid = isbn10_invalid = isbn13_invalid = 0
     languages = {}
     for r in results:
         lang = r.get('language', 'en')
-        if lang not in languages:
-            languages[lang] = {
+        lang_data = languages.get(lang)
+        if lang_data is None:
+            lang_data = languages[lang] = {
                 'articles': 0,
                 'valid_isbns': 0,
                 'invalid_isbns': 0,
                 'unique_valid': set(),
                 'unique_invalid': set()
             }
-        languages[lang]['articles'] += 1
-        languages[lang]['valid_isbns'] += len(r['valid_isbns'])
-        languages[lang]['invalid_isbns'] += len(r['invalid_isbns'])
-        
-        for isbn in r['valid_isbns']:
-            normalized = re.sub(r'[-\s]', '', isbn['isbn'])
-            unique_valid.add(normalized)
-            languages[lang]['unique_valid'].add(normalized)
-        for isbn in r['invalid_isbns']:
-            normalized = re.sub(r'[-\s]', '', isbn['isbn'])
-            unique_invalid.add(normalized)
-            languages[lang]['unique_invalid'].add(normalized)
+        valid_isbns = r['valid_isbns']
+        invalid_isbns = r['invalid_isbns']
+        lang_data['articles'] += 1
+        lang_data['valid_isbns'] += len(valid_isbns)
+        lang_data['invalid_isbns'] += len(invalid_isbns)
+        
+        # Use the normalized form cached at extraction time for both the
+        # unique sets and the ISBN-10/ISBN-13 format breakdown. The set
+        # methods are bound once per article rather than looked up per ISBN
+        add_valid = lang_data['unique_valid'].add
+        for isbn in valid_isbns:
+            normalized = isbn['cleaned']
+            add_valid(normalized)
+            n = len(normalized)
+            isbn10_valid += n == 10
+            isbn13_valid += n == 13
+        add_invalid = lang_data['unique_invalid'].add
+        for isbn in invalid_isbns:
+            normalized = isbn['cleaned']
+            add_invalid(normalized)
+            n = len(normalized)
+            isbn10_invalid += n == 10
+            isbn13_invalid += n == 13
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write("Wikipedia ISBN Extraction Report\n")
-        f.write("=" * 60 + "\n\n")
-        
-        f.write(f"Run Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Processing Time: {processing_time:.1f} seconds\n")
-        f.write(f"Processing Speed: {total_articles_processed/processing_time:.1f} articles/second\n\n")
-        
-        f.write(f"Wikis Processed: {len(dump_files)}\n")
-        f.write("Dump Files:\n")
-        for dump_file in dump_files:
-            f.write(f"  - {os.path.basename(dump_file)}\n")
-        f.write("\n")
-        
-        f.write("Article Statistics:\n")
-        f.write(f"  Total articles processed: {total_articles_processed:,}\n")
-        f.write(f"  Articles with ISBNs: {articles_with_isbns:,}\n")
-        f.write(f"  Articles without ISBNs: {total_articles_processed - articles_with_isbns:,}\n\n")
-        
-        f.write("ISBN Statistics:\n")
-        f.write(f"  Total ISBNs found: {total_isbns:,}\n")
-        f.write(f"  Valid ISBNs (checksum passed): {total_valid:,}\n")
-        f.write(f"  Invalid ISBNs (checksum failed): {total_invalid:,}\n")
-        f.write(f"  Pass rate: {(total_valid/total_isbns*100) if total_isbns > 0 else 0:.2f}%\n\n")
-        
-        f.write("Unique ISBN Statistics:\n")
-        f.write(f"  Unique valid ISBNs: {len(unique_valid):,}\n")
-        f.write(f"  Unique invalid ISBNs: {len(unique_invalid):,}\n\n")
-        
-        f.write("Format Breakdown:\n")
-        isbn10_valid = sum(1 for r in results for isbn in r['valid_isbns'] 
-                          if len(re.sub(r'[-\s]', '', isbn['isbn'])) == 10)
-        isbn13_valid = sum(1 for r in results for isbn in r['valid_isbns'] 
-                          if len(re.sub(r'[-\s]', '', isbn['isbn'])) == 13)
-        isbn10_invalid = sum(1 for r in results for isbn in r['invalid_isbns'] 
-                            if len(re.sub(r'[-\s]', '', isbn['isbn'])) == 10)
-        isbn13_invalid = sum(1 for r in results for isbn in r['invalid_isbns'] 
-                            if len(re.sub(r'[-\s]', '', isbn['isbn'])) == 13)
-        
-        f.write(f"  ISBN-10 (valid): {isbn10_valid:,}\n")
-        f.write(f"  ISBN-10 (invalid): {isbn10_invalid:,}\n")
-        f.write(f"  ISBN-13 (valid): {isbn13_valid:,}\n")
-        f.write(f"  ISBN-13 (invalid): {isbn13_invalid:,}\n\n")
-        
-        if len(languages) > 1:
-            f.write("Language Breakdown:\n")
-            for lang in sorted(languages.keys()):
-                lang_data = languages[lang]
-                lang_total = lang_data['valid_isbns'] + lang_data['invalid_isbns']
-                lang_pass_rate = (lang_data['valid_isbns']/lang_total*100) if lang_total > 0 else 0
-                f.write(f"\n  {lang.upper()}:\n")
+    # The overall unique sets are the union of the per-language ones, so
+    # each ISBN is only added to one set inside the loop
+    unique_valid = set().union(*(lang_data['unique_valid'] for lang_data in languages.values()))
+    unique_invalid = set().union(*(lang_data['unique_invalid'] for lang_data in languages.values()))
+    
+    # Derive the overall totals from the per-language aggregates rather than
+    # scanning every result again
+    total_valid = sum(lang_data['valid_isbns'] for lang_data in languages.values())
+    total_invalid = sum(lang_data['invalid_isbns'] for lang_data in languages.values())
+    total_isbns = total_valid + total_invalid
+    
+    # Build the report in memory and write it out in a single call
+    report_lines = []
+    w = report_lines.append
+    
+    w("Wikipedia ISBN Extraction Report\n")
+    w("=" * 60 + "\n\n")
+    
+    w(f"Run Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    w(f"Processing Time: {processing_time:.1f} seconds\n")
+    w(f"Processing Speed: {total_articles_processed/processing_time:.1f} articles/second\n\n")
+    
+    w(f"Wikis Processed: {len(dump_files)}\n")
+    w("Dump Files:\n")
+    for dump_file in dump_files:
+        w(f"  - {os.path.basename(dump_file)}\n")
+    w("\n")
+    
+    w("Article Statistics:\n")
+    w(f"  Total articles processed: {total_articles_processed:,}\n")
+    w(f"  Articles with ISBNs: {articles_with_isbns:,}\n")
+    w(f"  Articles without ISBNs: {total_articles_processed - articles_with_isbns:,}\n\n")
+    
+    w("ISBN Statistics:\n")
+    w(f"  Total ISBNs found: {total_isbns:,}\n")
+    w(f"  Valid ISBNs (checksum passed): {total_valid:,}\n")
+    w(f"  Invalid ISBNs (checksum failed): {total_invalid:,}\n")
+    w(f"  Pass rate: {(total_valid/total_isbns*100) if total_isbns > 0 else 0:.2f}%\n\n")
+    
+    w("Unique ISBN Statistics:\n")
+    w(f"  Unique valid ISBNs: {len(unique_valid):,}\n")
+    w(f"  Unique invalid ISBNs: {len(unique_invalid):,}\n\n")
+    
+    w("Format Breakdown:\n")
+    w(f"  ISBN-10 (valid): {isbn10_valid:,}\n")
+    w(f"  ISBN-10 (invalid): {isbn10_invalid:,}\n")
+    w(f"  ISBN-13 (valid): {isbn13_valid:,}\n")
+    w(f"  ISBN-13 (invalid): {isbn13_invalid:,}\n\n")
+    
+    if len(languages) > 1:
+        w("Language Breakdown:\n")
+        for lang in sorted(languages.keys()):
+            lang_data = languages[lang]
+            lang_total = lang_data['valid_isbns'] + lang_data['invalid_isbns']
+            lang_pass_rate = (lang_data['valid_isbns']/lang_total*100) if lang_total > 0 else 0
+            w(f"\n  {lang.upper()}:\n")
+            if language_article_counts and lang in language_article_counts:
+                w(f"    Total articles processed: {language_article_counts[lang]:,}\n")
+            w(f"    Articles with ISBNs: {lang_data['articles']:,}\n")
+            w(f"    Total ISBNs: {lang_total:,}\n")
+            w(f"    Valid ISBNs: {lang_data['valid_isbns']:,}\n")
+            w(f"    Invalid ISBNs: {lang_data['invalid_isbns']:,}\n")
+            w(f"    Pass rate: {lang_pass_rate:.2f}%\n")
+            w(f"    Unique valid: {len(lang_data['unique_valid']):,}\n")
+            w(f"    Unique invalid: {len(lang_data['unique_invalid']):,}\n")
+            if language_times and lang in language_times:
+                w(f"    Processing time: {language_times[lang]:.1f}s\n")
                 if language_article_counts and lang in language_article_counts:
-                    f.write(f"    Total articles processed: {language_article_counts[lang]:,}\n")
-                f.write(f"    Articles with ISBNs: {lang_data['articles']:,}\n")
-                f.write(f"    Total ISBNs: {lang_total:,}\n")
-                f.write(f"    Valid ISBNs: {lang_data['valid_isbns']:,}\n")
-                f.write(f"    Invalid ISBNs: {lang_data['invalid_isbns']:,}\n")
-                f.write(f"    Pass rate: {lang_pass_rate:.2f}%\n")
-                f.write(f"    Unique valid: {len(lang_data['unique_valid']):,}\n")
-                f.write(f"    Unique invalid: {len(lang_data['unique_invalid']):,}\n")
-                if language_times and lang in language_times:
-                    f.write(f"    Processing time: {language_times[lang]:.1f}s\n")
-                    if language_article_counts and lang in language_article_counts:
-                        f.write(f"    Speed: {language_article_counts[lang]/language_times[lang]:.1f} articles/sec\n")
+                    w(f"    Speed: {language_article_counts[lang]/language_times[lang]:.1f} articles/sec\n")
+    
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(''.join(report_lines))
     
     return filepath
 
 
+def get_article_url(result: dict) -> str:
+    """
+    Build the Wikipedia URL of an article result.
+    
+    Args:
+        result: Article result with 'title' and 'language' keys
+        
+    Returns:
+        URL such as https://en.wikipedia.org/wiki/Article_title
+    """
+    language = result.get('language', 'en')
+    return f"https://{language}.wikipedia.org/wiki/{result['title'].replace(' ', '_')}"
+
+
+# Columns of the failed-ISBN CSV
+CSV_FIELDNAMES = ('article_title', 'language', 'isbn', 'format', 'context', 'article_url')
+
+# Write buffer size for the failed-ISBN CSV
+CSV_WRITE_BUFFER = 1 << 20
+
+
 def save_failed_isbns_to_csv(results: list[dict], filename: str = None) -> str:
     """
     Save only failed ISBNs to a CSV file for inspection.
@@ -600,37 +1073,39 @@ def save_failed_isbns_to_csv(results: list[dict], filename: str = None) -> str:
     os.makedirs("../data", exist_ok=True)
     filepath = os.path.join("../data", filename)
     
-    with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['article_title', 'language', 'isbn', 'format', 'context', 'article_url']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        
-        # Only write invalid ISBNs
+    def failed_rows():
+        """Yield one row per invalid ISBN, in CSV_FIELDNAMES order."""
         for result in results:
+            invalid_isbns = result.get('invalid_isbns')
+            if not invalid_isbns:
+                continue
+            
+            # Only articles that are written out need their URL built
             article_title = result['title']
-            article_url = result.get('url', '')
+            language = result.get('language', 'en')
+            article_url = get_article_url(result)
             
-            for isbn_data in result.get('invalid_isbns', []):
-                isbn = isbn_data['isbn']
-                cleaned = re.sub(r'[-\s]', '', isbn)
-                
-                # Determine ISBN format
-                if len(cleaned) == 10:
-                    isbn_format = 'ISBN-10'
-                elif len(cleaned) == 13:
-                    isbn_format = 'ISBN-13'
-                else:
-                    isbn_format = f'Invalid ({len(cleaned)} digits)'
-                
-                writer.writerow({
-                    'article_title': article_title,
-                    'language': result.get('language', 'en'),
-                    'isbn': isbn,
-                    'format': isbn_format,
-                    'context': isbn_data['context'],
-                    'article_url': article_url
-                })
+            for isbn_data in invalid_isbns:
+                # Determine ISBN format from the normalized form cached at
+                # extraction time
+                length = len(isbn_data['cleaned'])
+                yield (
+                    article_title,
+                    language,
+                    isbn_data['isbn'],
+                    ISBN_FORMATS.get(length, f'Invalid ({length} digits)'),
+                    isbn_data['context'],
+                    article_url
+                )
+    
+    # A large write buffer and a plain csv.writer fed tuples avoid the
+    # per-row dict remapping of DictWriter and most of the write calls
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_FIELDNAMES)
+        
+        # Only write invalid ISBNs
+        writer.writerows(failed_rows())
     
     return filepath
 
@@ -641,13 +1116,15 @@ def main():
     parser.add_argument('--context', type=int, default=50, help='Number of context characters around ISBN (default: 50)')
     parser.add_argument('--proximity', type=int, default=6, help='Maximum characters between ISBN and number (default: 6)')
     parser.add_argument('--workers', type=int, default=1, help='Number of parallel workers (-1 for all CPUs, default: 1)')
+    parser.add_argument('--article-batch', type=int, default=64, help='Articles per worker batch when splitting a single dump across workers (default: 64)')
+    parser.add_argument('--cache-decompressed', action='store_true', help='Keep decompressed XML next to each dump and memory-map it on later runs')
     parser.add_argument('--output-prefix', help='Output file prefix (default: timestamp)')
     
     args = parser.parse_args()
     
     # Process all dump files
     results, dump_files, start_time, end_time, language_times, total_articles_processed, language_article_counts = process_all_dumps(
-        args.dumps_dir, args.context, args.proximity, args.workers
+        args.dumps_dir, args.context, args.proximity, args.workers, args.article_batch, args.cache_decompressed
     )
     
     if not results:
@@ -672,10 +1149,13 @@ def main():
     
     # Print time breakdown by language
     if language_times:
+        # Group articles by language once instead of rescanning results per language
+        articles_with_isbns_by_lang = Counter(r.get('language', 'en') for r in results)
+        
         print(f"\nProcessing time by language:")
         for lang in sorted(language_times.keys()):
             lang_time = language_times[lang]
-            lang_articles_with_isbns = len([r for r in results if r.get('language', 'en') == lang])
+            lang_articles_with_isbns = articles_with_isbns_by_lang[lang]
             lang_total_articles = language_article_counts.get(lang, lang_articles_with_isbns) if language_article_counts else lang_articles_with_isbns
             speed = lang_total_articles / lang_time if lang_time > 0 else 0
             print(f"  {lang.upper()}: {lang_time:.1f}s ({lang_total_articles:,} articles processed, {lang_articles_with_isbns:,} with ISBNs, {speed:.1f} articles/sec)")
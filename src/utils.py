@@ -6,12 +6,27 @@ This module contains helper functions for analyzing ISBN validation results,
 checking dump file formats, and extracting statistics from reports.
 """
 
-import re
 import bz2
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+from main import strip_isbn_separators
+
+# Columns of the failed-ISBN CSV that analyze_invalid_isbns actually reads,
+# with the value counted when a row or the whole file lacks the column
+ANALYZED_CSV_COLUMNS = {
+    'format': 'Unknown',
+    'language': 'unknown',
+    'article_title': 'Unknown',
+}
+
+# Rows of the failed-ISBN CSV analysed per chunk
+CSV_CHUNK_ROWS = 500_000
+
 
 def check_dump_namespace(dump_path: str) -> Optional[str]:
     """
@@ -24,15 +39,17 @@ def check_dump_namespace(dump_path: str) -> Optional[str]:
         The namespace URI if found, None otherwise
     """
     try:
-        with bz2.open(dump_path, 'rt', encoding='utf-8') as f:
-            # Read first few KB to find namespace
+        with bz2.open(dump_path, 'rb') as f:
+            # Read first few KB to find namespace. The header is ASCII, so
+            # search the raw bytes and only decode the URI itself.
             content = f.read(4096)
             
-            if 'xmlns=' in content:
+            start = content.find(b'xmlns="')
+            if start != -1:
                 # Extract namespace
-                start = content.find('xmlns="') + 7
-                end = content.find('"', start)
-                return content[start:end]
+                start += 7
+                end = content.find(b'"', start)
+                return content[start:end].decode('utf-8')
     except Exception as e:
         print(f"Error checking namespace: {e}")
     
@@ -60,19 +77,41 @@ def extract_pass_rates_from_report(file_path: str) -> List[Tuple[str, float]]:
     # Extract content after Language Breakdown
     language_content = content[language_section_start:]
     
-    # Pattern to match wiki entries with their statistics
-    wiki_pattern = r'  ([A-Z]+(?:-[A-Z]+)?):\n.*?Pass rate: ([\d.]+)%'
-    
-    matches = re.findall(wiki_pattern, language_content, re.DOTALL)
-    
-    # Create list of tuples (wiki_code, pass_rate)
+    # Walk the section line by line: a wiki header such as "  EN:" is
+    # followed by its statistics, one of which is "Pass rate: 12.34%"
     results = []
-    for wiki_code, pass_rate in matches:
-        results.append((wiki_code, float(pass_rate)))
+    current_wiki = None
+    for line in language_content.splitlines():
+        stripped = line.strip()
+        if stripped.endswith(':') and _is_wiki_code(stripped[:-1]):
+            current_wiki = stripped[:-1]
+        elif current_wiki and stripped.startswith('Pass rate:') and stripped.endswith('%'):
+            results.append((current_wiki, float(stripped[10:-1])))
+            current_wiki = None
     
     return results
 
 
+def _is_wiki_code(name: str) -> bool:
+    """
+    Check whether a report header names a wiki, e.g. 'EN' or 'ZH-YUE'.
+    """
+    parts = name.split('-')
+    return len(parts) <= 2 and all(part.isascii() and part.isalpha() and part.isupper() for part in parts)
+
+
+def _count_column(counter: Dict[str, int], rows: List[List[str]], header: List[str], column: str, default: str) -> None:
+    """
+    Add every value of a CSV column to a Counter in a single update.
+    
+    Rows from a file without the column are counted under the default value.
+    """
+    if column in header:
+        counter.update(map(itemgetter(header.index(column)), rows))
+    else:
+        counter[default] += len(rows)
+
+
 def analyze_invalid_isbns(csv_path: str) -> Dict[str, any]:
     """
     Analyze patterns in invalid ISBNs from a CSV file.
@@ -84,7 +123,7 @@ def analyze_invalid_isbns(csv_path: str) -> Dict[str, any]:
         Dictionary containing analysis results
     """
     import csv
-    from collections import Counter, defaultdict
+    from collections import Counter
     
     stats = {
         'total_invalid': 0,
@@ -94,17 +133,47 @@ def analyze_invalid_isbns(csv_path: str) -> Dict[str, any]:
         'articles_with_most_errors': []
     }
     
-    article_errors = defaultdict(int)
+    article_errors = Counter()
     
     try:
         with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
+            reader = csv.reader(csvfile)
+            file_header = next(reader, [])
+            
+            # Only load the analysed columns so the wide context and URL
+            # fields are never held in memory
+            header = [name for name in ANALYZED_CSV_COLUMNS if name in file_header]
+            indices = [file_header.index(name) for name in header]
             
-            for row in reader:
-                stats['total_invalid'] += 1
-                stats['by_format'][row.get('format', 'Unknown')] += 1
-                stats['by_language'][row.get('language', 'unknown')] += 1
-                article_errors[row.get('article_title', 'Unknown')] += 1
+            # Short rows are padded so missing analysed fields get their
+            # default value
+            width = max(indices, default=-1) + 1
+            padding = [''] * width
+            for name, i in zip(header, indices):
+                padding[i] = ANALYZED_CSV_COLUMNS[name]
+            
+            # Stream the file in fixed-size chunks so memory stays bounded
+            # regardless of how large the CSV is
+            while True:
+                rows = []
+                rows_read = 0
+                for row in islice(reader, CSV_CHUNK_ROWS):
+                    rows_read += 1
+                    if not row:
+                        continue  # Blank line
+                    if len(row) < width:
+                        row = row + padding[len(row):]
+                    rows.append([row[i] for i in indices])
+                if not rows_read:
+                    break
+                
+                stats['total_invalid'] += len(rows)
+                
+                # Count whole columns at once rather than bumping counters per row
+                for counter, column in ((stats['by_format'], 'format'),
+                                        (stats['by_language'], 'language'),
+                                        (article_errors, 'article_title')):
+                    _count_column(counter, rows, header, column, ANALYZED_CSV_COLUMNS[column])
         
         # Get top articles with most errors
         stats['articles_with_most_errors'] = article_errors.most_common(10)
@@ -141,9 +210,13 @@ def compare_dump_structures(dump1_path: str, dump2_path: str) -> Dict[str, any]:
                 event, root = next(context)
                 
                 page_count = 0
+                local_names = {}  # Namespaced tag -> local name, split once per tag
                 for event, elem in context:
-                    tag = elem.tag.split('}')[1] if '}' in elem.tag else elem.tag
-                    elements.add(tag)
+                    tag = local_names.get(elem.tag)
+                    if tag is None:
+                        tag = elem.tag.split('}')[1] if '}' in elem.tag else elem.tag
+                        local_names[elem.tag] = tag
+                        elements.add(tag)
                     
                     if event == 'end' and tag == 'page':
                         page_count += 1
@@ -157,12 +230,20 @@ def compare_dump_structures(dump1_path: str, dump2_path: str) -> Dict[str, any]:
         
         return elements
     
-    elements1 = get_elements(dump1_path)
-    elements2 = get_elements(dump2_path)
+    # The four scans are independent and bz2 decompression releases the GIL,
+    # so run them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        elements1_future = executor.submit(get_elements, dump1_path)
+        elements2_future = executor.submit(get_elements, dump2_path)
+        namespace1_future = executor.submit(check_dump_namespace, dump1_path)
+        namespace2_future = executor.submit(check_dump_namespace, dump2_path)
+        
+        elements1 = elements1_future.result()
+        elements2 = elements2_future.result()
     
     return {
-        'dump1_namespace': check_dump_namespace(dump1_path),
-        'dump2_namespace': check_dump_namespace(dump2_path),
+        'dump1_namespace': namespace1_future.result(),
+        'dump2_namespace': namespace2_future.result(),
         'common_elements': elements1 & elements2,
         'only_in_dump1': elements1 - elements2,
         'only_in_dump2': elements2 - elements1
@@ -179,8 +260,23 @@ def format_statistics_summary(results: List[dict]) -> str:
     Returns:
         Formatted string with statistics
     """
-    total_valid = sum(len(r['valid_isbns']) for r in results)
-    total_invalid = sum(len(r['invalid_isbns']) for r in results)
+    # Count totals and collect ISBN spellings in a single pass over the results
+    total_valid = 0
+    total_invalid = 0
+    raw_valid = set()
+    raw_invalid = set()
+    
+    for r in results:
+        total_valid += len(r['valid_isbns'])
+        total_invalid += len(r['invalid_isbns'])
+        raw_valid.update(isbn['isbn'] for isbn in r['valid_isbns'])
+        raw_invalid.update(isbn['isbn'] for isbn in r['invalid_isbns'])
+    
+    # The same ISBN is cited many times, so normalize each distinct
+    # spelling once rather than every occurrence
+    unique_valid = {strip_isbn_separators(isbn) for isbn in raw_valid}
+    unique_invalid = {strip_isbn_separators(isbn) for isbn in raw_invalid}
+    
     total_isbns = total_valid + total_invalid
     
     if total_isbns == 0:
@@ -188,18 +284,6 @@ def format_statistics_summary(results: List[dict]) -> str:
     
     pass_rate = (total_valid / total_isbns) * 100
     
-    # Count unique ISBNs
-    unique_valid = set()
-    unique_invalid = set()
-    
-    for r in results:
-        for isbn in r['valid_isbns']:
-            normalized = re.sub(r'[-\s]', '', isbn['isbn'])
-            unique_valid.add(normalized)
-        for isbn in r['invalid_isbns']:
-            normalized = re.sub(r'[-\s]', '', isbn['isbn'])
-            unique_invalid.add(normalized)
-    
     return f"""
 ISBN Validation Summary
 =======================